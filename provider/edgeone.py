@@ -39,7 +39,7 @@ class EdgeoneProvider(ToolProvider):
                         base_url,
                         headers=headers,
                         json=body,
-                        timeout=10
+                        timeout=(3.05, 10)
                     )
                     
                     if response.status_code == 200:
@@ -0,0 +1,185 @@
+import io
+import time
+
+import pytest
+
+import tools.deploy_folder_or_zip as deploy_module
+from tools.deploy_folder_or_zip import EdgeOneAPIError, EdgeOneDeployer, _PrefixedStream
+
+
+def test_cos_signature_matches_published_example():
+    # PUT object example from the COS "request signature" documentation
+    deployer = EdgeOneDeployer("token")
+    credentials = {
+        'TmpSecretId': 'AKIDQjz3ltompVjBni5LitkWHFlFpwkn9U5q',
+        'TmpSecretKey': 'BQYIM75p8x0iWVFSIgqEKwFprpRSVHlz',
+    }
+    headers = {
+        'Date': 'Thu, 16 May 2019 06:45:51 GMT',
+        'Host': 'examplebucket-1250000000.cos.ap-beijing.myqcloud.com',
+        'Content-Type': 'text/plain',
+        'Content-Length': '13',
+        'Content-MD5': 'mQ/fVh815F3k6TAUm8m0eg==',
+        'x-cos-acl': 'private',
+        'x-cos-grant-read': 'uin="100000000011"',
+    }
+    
+    authorization = deployer._cos_signature(
+        credentials, 'PUT', '/exampleobject(腾讯云)', headers, key_time='1557989151;1557996351'
+    )
+    deployer.close()
+    
+    assert authorization == (
+        'q-sign-algorithm=sha1&q-ak=AKIDQjz3ltompVjBni5LitkWHFlFpwkn9U5q'
+        '&q-sign-time=1557989151;1557996351&q-key-time=1557989151;1557996351'
+        '&q-header-list=content-length;content-md5;content-type;date;host;x-cos-acl;x-cos-grant-read'
+        '&q-url-param-list=&q-signature=3b8851a11a569213c17ba8fa7dcf2abec6935172'
+    )
+
+
+def test_prefixed_stream_replays_prefix_in_chunks():
+    source = io.BytesIO(b'PK\x03\x04hello world')
+    prefix = source.read(4)
+    stream = _PrefixedStream(prefix, source, 15)
+    
+    chunks = []
+    while True:
+        chunk = stream.read(3)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    
+    assert len(stream) == 15
+    assert chunks[0] == b'PK\x03'
+    assert b''.join(chunks) == b'PK\x03\x04hello world'
+
+
+def test_prefixed_stream_read_all():
+    source = io.BytesIO(b'PK\x03\x04rest')
+    prefix = source.read(4)
+    stream = _PrefixedStream(prefix, source, 8)
+    
+    assert stream.read() == b'PK\x03\x04rest'
+    assert stream.read() == b''
+
+
+def _deployments_response(*deployment_ids):
+    deployments = [{'DeploymentId': deployment_id, 'Status': 'Process'} for deployment_id in deployment_ids]
+    return {'Code': 0, 'Data': {'Response': {'Deployments': deployments}}}
+
+
+def _status_deployer(filtered):
+    """Deployer whose filtered lookup behaves like `filtered` and whose listing holds d2 and d1"""
+    deployer = EdgeOneDeployer("token")
+    deployer.calls = []
+    
+    def make_api_request(body):
+        is_filtered = 'Filters' in body
+        deployer.calls.append('filtered' if is_filtered else 'list')
+        if not is_filtered:
+            return _deployments_response('d2', 'd1')
+        if isinstance(filtered, Exception):
+            raise filtered
+        return filtered
+    
+    deployer._make_api_request = make_api_request
+    return deployer
+
+
+def test_deployment_status_stops_filtering_when_filter_rejected():
+    deployer = _status_deployer(EdgeOneAPIError("API error: invalid filter"))
+    
+    assert deployer._get_deployment_status('p', 'd1')['DeploymentId'] == 'd1'
+    assert deployer._deployment_filter_supported is False
+    
+    deployer._get_deployment_status('p', 'd1')
+    deployer.close()
+    assert deployer.calls == ['filtered', 'list', 'list']
+
+
+def test_deployment_status_stops_filtering_when_filter_ignored():
+    deployer = _status_deployer(_deployments_response('d2'))
+    
+    assert deployer._get_deployment_status('p', 'd1')['DeploymentId'] == 'd1'
+    assert deployer._deployment_filter_supported is False
+    
+    deployer._get_deployment_status('p', 'd1')
+    deployer.close()
+    assert deployer.calls == ['filtered', 'list', 'list']
+
+
+def test_deployment_status_lists_once_when_filtered_result_empty():
+    deployer = _status_deployer(_deployments_response())
+    
+    assert deployer._get_deployment_status('p', 'd1')['DeploymentId'] == 'd1'
+    assert deployer._deployment_filter_supported is True
+    
+    deployer._get_deployment_status('p', 'd1')
+    deployer.close()
+    assert deployer.calls == ['filtered', 'list', 'filtered', 'list']
+
+
+class _FakeResponse:
+    def __init__(self, status_code, headers=None, body=b''):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.raw = io.BytesIO(body)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+def _probe(response):
+    deployer = EdgeOneDeployer("token")
+    deployer.session.get = lambda url, **kwargs: response
+    try:
+        return deployer._probe_file("https://dify.example/files/site.zip")
+    finally:
+        deployer.close()
+
+
+def test_probe_file_reads_size_from_content_range():
+    response = _FakeResponse(206, {'Content-Range': 'bytes 0-3/2048'}, b'PK\x03\x04')
+    assert _probe(response) == 2048
+
+
+def test_probe_file_reads_size_from_content_length_when_range_ignored():
+    response = _FakeResponse(200, {'Content-Length': '4096'}, b'PK\x03\x04rest of the archive')
+    assert _probe(response) == 4096
+
+
+def test_probe_file_leaves_encoded_body_to_the_download():
+    response = _FakeResponse(200, {'Content-Encoding': 'gzip', 'Content-Length': '99'}, b'\x1f\x8b')
+    assert _probe(response) is None
+
+
+def test_probe_file_rejects_empty_file():
+    with pytest.raises(Exception, match="Only ZIP files are supported"):
+        _probe(_FakeResponse(416))
+
+
+def test_probe_file_rejects_non_zip_body():
+    response = _FakeResponse(206, {'Content-Range': 'bytes 0-3/12'}, b'<htm')
+    with pytest.raises(Exception, match="Only ZIP files are supported"):
+        _probe(response)
+
+
+def test_encipher_cache_evicts_expired_domains(monkeypatch):
+    monkeypatch.setattr(deploy_module, '_ENCIPHER_CACHE', {
+        'old.example': ('stale', '1', time.monotonic() - deploy_module.ENCIPHER_CACHE_TTL - 1),
+    })
+    deployer = EdgeOneDeployer("token")
+    deployer._make_api_request = lambda body: {
+        'Code': 0, 'Data': {'Response': {'Token': 'fresh', 'Timestamp': '2'}}
+    }
+    
+    assert deployer._get_encipher_token('new.example') == ('fresh', '2')
+    deployer.close()
+    assert list(deploy_module._ENCIPHER_CACHE) == ['new.example']
@@ -1,16 +1,90 @@
 import os
+import json
 import time
+import random
+import hashlib
+import hmac
+import threading
+import shutil
 import tempfile
 import zipfile
 from collections.abc import Generator
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
+from urllib.parse import quote
 
 import requests
-from qcloud_cos import CosConfig, CosS3Client
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dify_plugin import Tool
 from dify_plugin.entities.tool import ToolInvokeMessage
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# API endpoint discovered per API token, shared across deployer instances
+_BASE_URL_CACHE: Dict[str, str] = {}
+
+# Encipher tokens per domain as (token, timestamp, fetched_at), reused for a short while
+_ENCIPHER_CACHE: Dict[str, Tuple[str, str, float]] = {}
+_ENCIPHER_CACHE_LOCK = threading.Lock()
+ENCIPHER_CACHE_TTL = 60
+
+# Don't forward the EdgeOne API headers to the Dify file server
+FILE_SERVER_HEADERS = {'Authorization': None, 'Content-Type': None}
+
+# Local file header signature every ZIP archive starts with
+ZIP_MAGIC = b'PK\x03\x04'
+
+# Files larger than this (in bytes) are uploaded to COS in parallel parts
+MULTIPART_THRESHOLD = 20 * 1024 * 1024
+
+# Route single-object uploads through the COS SDK instead of signed PUTs
+USE_COS_SDK = os.environ.get('USE_COS_SDK', '').lower() in ('1', 'true', 'yes')
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a request body, preferring orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse a response body, preferring orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class EdgeOneAPIError(Exception):
+    """Raised when the EdgeOne API answers with a non-zero Code"""
+
+
+class _PrefixedStream:
+    """File-like body that replays bytes already read from a stream before the rest of it"""
+    
+    def __init__(self, prefix: bytes, stream, length: int):
+        self._prefix = prefix
+        self._stream = stream
+        self._length = length
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size < 0:
+            data, self._prefix = self._prefix + self._stream.read(), b''
+            return data
+        
+        data, self._prefix = self._prefix[:size], self._prefix[size:]
+        if len(data) < size:
+            data += self._stream.read(size - len(data))
+        return data
+
 
 class DeployFolderOrZipTool(Tool):
     def _invoke(self, tool_parameters: dict[str, Any]) -> Generator[ToolInvokeMessage, None, None]:
@@ -41,22 +115,24 @@ class DeployFolderOrZipTool(Tool):
                 yield self.create_text_message("❌ Only ZIP files are supported for deployment.")
                 return
             
-            yield self.create_text_message(f"🚀 Starting deployment of ZIP file: {filename}")
-            yield self.create_text_message(f"📋 Environment: {environment}")
+            yield self.create_text_message(
+                f"🚀 Starting deployment of ZIP file: {filename}\n📋 Environment: {environment}"
+            )
+            
+            # Collect status lines so the result crosses the plugin boundary as one message
+            status_lines: list[str] = []
             
-            # Download and save the file temporarily
-            zip_path = self._download_file(zip_file)
+            # Initialize deployment helper
+            deployer: EdgeOneDeployer = EdgeOneDeployer(api_token, project_name)
             
             try:
-                # Initialize deployment helper
-                deployer: EdgeOneDeployer = EdgeOneDeployer(api_token, project_name)
-                
                 # Deploy
-                result_url = deployer.deploy(zip_path, environment)
+                result_url = deployer.deploy(zip_file, environment)
                 
                 # Return success
-                yield self.create_text_message("✅ Deployment completed successfully!")
-                yield self.create_text_message(f"🌐 Public URL: {result_url}")
+                status_lines.append("✅ Deployment completed successfully!")
+                status_lines.append(f"🌐 Public URL: {result_url}")
+                yield self.create_text_message("\n".join(status_lines))
                 yield self.create_json_message({
                     "success": True,
                     "url": result_url,
@@ -65,9 +141,8 @@ class DeployFolderOrZipTool(Tool):
                     "message": f"ZIP file {filename} deployed successfully to EdgeOne Pages"
                 })
             finally:
-                # Cleanup temporary file
-                if os.path.exists(zip_path):
-                    os.unlink(zip_path)
+                # Release pooled connections
+                deployer.close()
             
         except Exception as e:
             error_message = f"❌ Deployment failed: {str(e)}"
@@ -77,49 +152,56 @@ class DeployFolderOrZipTool(Tool):
                 "error": str(e),
                 "type": "zip_deployment"
             })
-    
-    def _download_file(self, file_obj) -> str:
-        """Download file from Dify file object to temporary location"""
-        # 直接访问文件对象的属性
-        file_url = file_obj.url
-        filename = file_obj.filename or 'upload.zip'
-        
-        if not file_url:
-            raise Exception("File URL not provided")
-        
-        # Create temporary file
-        temp_dir = tempfile.mkdtemp()
-        temp_path = os.path.join(temp_dir, filename)
-        
-        # Download file
-        response = requests.get(file_url, stream=True, timeout=30)
-        response.raise_for_status()
-        
-        with open(temp_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        return temp_path
 
 
 class EdgeOneDeployer:
     def __init__(self, api_token: str, project_name: str = ""):
         self.api_token = api_token
+        self._auth_header = f'Bearer {api_token}'
         self.project_name = project_name
         self.base_api_url = ""
         self.temp_project_name = f"dify-upload-{int(time.time())}"
+        self.session = self._create_session()
+        self._deployment_filter_supported = True
+        self._projects_cache: Dict[tuple, List[Dict]] = {}
+        self._cos_client_cache: Dict[tuple, Any] = {}
     
-    def deploy(self, local_path: str, environment: str = "Production") -> str:
+    def _create_session(self) -> requests.Session:
+        """Create a pooled HTTP session shared by all API calls"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            pool_block=False,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        session.mount('https://', adapter)
+        session.headers.update({
+            'Authorization': self._auth_header,
+            'Content-Type': 'application/json',
+        })
+        return session
+    
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
+    
+    def deploy(self, file_obj, environment: str = "Production") -> str:
         """Main deployment function"""
+        # Validate it's a ZIP file before any EdgeOne API work
+        if not (file_obj.filename or '').lower().endswith('.zip'):
+            raise Exception("Only ZIP files are supported")
+        content_length = self._probe_file(file_obj.url)
+        
         # Determine base API URL
         self._check_and_set_base_url()
         
-        # Validate it's a ZIP file
-        if not self._is_zip_file(local_path):
-            raise Exception("Only ZIP files are supported")
-        
         # Upload to COS
-        target_path = self._upload_to_cos(local_path, True)
+        target_path = self._upload_to_cos(file_obj, True, content_length)
         
         # Get or create project
         project_id = self._get_or_create_project()
@@ -140,10 +222,12 @@ class EdgeOneDeployer:
             'https://pages-api.edgeone.ai/v1'
         ]
         
-        headers = {
-            'Authorization': f'Bearer {self.api_token}',
-            'Content-Type': 'application/json',
-        }
+        # Reuse the endpoint discovered by an earlier deploy with the same token
+        token_hash = hashlib.blake2b(self.api_token.encode(), digest_size=8).hexdigest()
+        cached_url = _BASE_URL_CACHE.get(token_hash)
+        if cached_url:
+            self.base_api_url = cached_url
+            return
         
         body = {
             'Action': 'DescribePagesProjects',
@@ -151,24 +235,41 @@ class EdgeOneDeployer:
             'PageSize': 10,
         }
         
-        for base_url in base_urls:
+        def probe(base_url: str) -> bool:
             try:
-                response = requests.post(base_url, headers=headers, json=body, timeout=10)
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('Code') == 0:
-                        self.base_api_url = base_url
-                        return
+                with self.session.post(base_url, json=body, timeout=(3.05, 10)) as response:
+                    if response.status_code == 200:
+                        result = response.json()
+                        return result.get('Code') == 0
             except Exception:
-                continue
+                pass
+            return False
+        
+        # Probe both endpoints concurrently and take the first that accepts the token
+        executor = ThreadPoolExecutor(max_workers=2)
+        futures = {executor.submit(probe, base_url): base_url for base_url in base_urls}
+        try:
+            for future in as_completed(futures):
+                if future.result():
+                    self.base_api_url = futures[future]
+                    _BASE_URL_CACHE[token_hash] = self.base_api_url
+                    return
+        finally:
+            # Don't wait on the slower probe once an endpoint has answered
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
         
         raise Exception("Invalid API token. Please check your EdgeOne Pages API token.")
     
-    def _is_zip_file(self, file_path: str) -> bool:
-        """Check if file is a ZIP file"""
-        return file_path.lower().endswith('.zip')
+    def _read_zip_header(self, stream) -> bytes:
+        """Read the first bytes of a download and fail fast if it isn't a ZIP file"""
+        header = stream.read(len(ZIP_MAGIC))
+        if header != ZIP_MAGIC:
+            raise Exception("Only ZIP files are supported")
+        return header
     
-    def _upload_to_cos(self, local_path: str, is_zip: bool) -> str:
+    def _upload_to_cos(self, file_obj, is_zip: bool, content_length: Optional[int] = None) -> str:
         """Upload ZIP file to EdgeOne COS"""
         # Get COS temporary token
         token_result = self._get_cos_temp_token()
@@ -182,7 +283,69 @@ class EdgeOneDeployer:
         target_path = response['TargetPath']
         credentials = response['Credentials']
         
-        # Initialize COS client
+        # Upload single ZIP file
+        file_name = os.path.basename(file_obj.filename or 'upload.zip')
+        key = f"{target_path}/{file_name}"
+        
+        if content_length is not None and content_length <= MULTIPART_THRESHOLD:
+            self._upload_stream_to_cos(bucket, region, key, credentials, file_obj.url, content_length)
+            return key
+        
+        # Large or unknown size, stage the file on disk before uploading
+        local_path = self._download_file(file_obj)
+        try:
+            self._upload_file_to_cos(bucket, region, key, credentials, local_path)
+        finally:
+            try:
+                os.unlink(local_path)
+            except FileNotFoundError:
+                pass
+        
+        return key
+    
+    def _upload_file_to_cos(self, bucket: str, region: str, key: str, credentials: Dict, local_path: str):
+        """Upload a local file, using parallel multipart upload for large files"""
+        if os.path.getsize(local_path) > MULTIPART_THRESHOLD:
+            try:
+                cos_client = self._create_cos_client(region, credentials)
+                cos_client.upload_file(
+                    Bucket=bucket,
+                    Key=key,
+                    LocalFilePath=local_path,
+                    PartSize=10,
+                    MAXThread=8,
+                    EnableMD5=False
+                )
+                return
+            except (ImportError, AttributeError, TypeError):
+                # SDK missing or without upload_file support, fall back to a single PUT
+                pass
+        
+        with open(local_path, 'rb') as file_data:
+            self._put_object(bucket, region, key, credentials, file_data, os.path.getsize(local_path))
+    
+    def _put_object(self, bucket: str, region: str, key: str, credentials: Dict, body, content_length: int):
+        """Upload a single object, through the COS SDK only when USE_COS_SDK is set"""
+        if USE_COS_SDK:
+            cos_client = self._create_cos_client(region, credentials)
+            cos_client.put_object(
+                Bucket=bucket,
+                Body=body,
+                Key=key,
+                ContentLength=content_length
+            )
+        else:
+            self._cos_put(bucket, region, key, credentials, body)
+    
+    def _create_cos_client(self, region: str, credentials: Dict):
+        """Get a COS SDK client, importing the SDK only when it is needed"""
+        # A rotated token comes with a new SecretId, which naturally misses the cache
+        cache_key = (region, credentials['TmpSecretId'])
+        if cache_key in self._cos_client_cache:
+            return self._cos_client_cache[cache_key]
+        
+        from qcloud_cos import CosConfig, CosS3Client
+        
         config = CosConfig(
             Region=region,
             SecretId=credentials['TmpSecretId'],
@@ -191,18 +354,122 @@ class EdgeOneDeployer:
         )
         cos_client = CosS3Client(config)
         
-        # Upload single ZIP file
-        file_name = os.path.basename(local_path)
-        key = f"{target_path}/{file_name}"
+        self._cos_client_cache[cache_key] = cos_client
+        return cos_client
+    
+    def _cos_put(self, bucket: str, region: str, key: str, credentials: Dict, body):
+        """PUT an object to COS with the pooled session"""
+        host = f"{bucket}.cos.{region}.myqcloud.com"
+        path = '/' + key.lstrip('/')
         
-        with open(local_path, 'rb') as file_data:
-            cos_client.put_object(
-                Bucket=bucket,
-                Body=file_data,
-                Key=key
-            )
+        # Upload bodies are streamed and can't be replayed, so don't retry them
+        endpoint = f"https://{host}"
+        if endpoint not in self.session.adapters:
+            self.session.mount(endpoint, HTTPAdapter(max_retries=0))
         
-        return key
+        headers = {
+            'Authorization': self._cos_signature(credentials, 'put', path, {'host': host}),
+            'Content-Type': 'application/zip',
+            'x-cos-security-token': credentials['Token'],
+        }
+        
+        response = self.session.put(f"{endpoint}{quote(path)}", data=body, headers=headers, timeout=(3.05, 300))
+        if response.status_code != 200:
+            raise Exception(f"Failed to upload to COS: HTTP {response.status_code} {response.text[:200]}")
+    
+    def _cos_signature(self, credentials: Dict, method: str, path: str, headers: Dict[str, str], key_time: Optional[str] = None) -> str:
+        """Build a COS v5 (q-sign-algorithm=sha1) Authorization header"""
+        if key_time is None:
+            now = int(time.time())
+            key_time = f"{now - 60};{now + 3600}"
+        
+        signed_headers = sorted((name.lower(), quote(value, safe='-_.~')) for name, value in headers.items())
+        header_list = ';'.join(name for name, _ in signed_headers)
+        header_string = '&'.join(f"{name}={value}" for name, value in signed_headers)
+        
+        http_string = f"{method.lower()}\n{path}\n\n{header_string}\n"
+        string_to_sign = f"sha1\n{key_time}\n{hashlib.sha1(http_string.encode()).hexdigest()}\n"
+        
+        sign_key = hmac.new(credentials['TmpSecretKey'].encode(), key_time.encode(), hashlib.sha1).hexdigest()
+        signature = hmac.new(sign_key.encode(), string_to_sign.encode(), hashlib.sha1).hexdigest()
+        
+        return (
+            f"q-sign-algorithm=sha1&q-ak={credentials['TmpSecretId']}"
+            f"&q-sign-time={key_time}&q-key-time={key_time}"
+            f"&q-header-list={header_list}&q-url-param-list="
+            f"&q-signature={signature}"
+        )
+    
+    def _probe_file(self, file_url: str) -> Optional[int]:
+        """Check the Dify file starts like a ZIP and get its size, or None if the size is unknown"""
+        if not file_url:
+            raise Exception("File URL not provided")
+        
+        headers = {
+            **FILE_SERVER_HEADERS,
+            'Range': f'bytes=0-{len(ZIP_MAGIC) - 1}',
+            'Accept-Encoding': 'identity',
+        }
+        
+        with self.session.get(file_url, headers=headers, stream=True, timeout=(3.05, 10)) as response:
+            # An empty file can't satisfy the range
+            if response.status_code == 416:
+                raise Exception("Only ZIP files are supported")
+            response.raise_for_status()
+            
+            # Encoded bytes can't be checked or sized here, leave that to the download
+            if response.headers.get('Content-Encoding', 'identity') != 'identity':
+                return None
+            
+            self._read_zip_header(response.raw)
+            
+            if response.status_code == 206:
+                size = response.headers.get('Content-Range', '').rpartition('/')[2]
+            else:
+                # Range ignored, the full body was offered
+                size = response.headers.get('Content-Length', '')
+        
+        return int(size) if size.isdigit() else None
+    
+    def _upload_stream_to_cos(self, bucket: str, region: str, key: str, credentials: Dict, file_url: str, content_length: int):
+        """Stream the Dify file straight into COS without touching disk"""
+        with self.session.get(file_url, headers=FILE_SERVER_HEADERS, stream=True, timeout=(3.05, 30)) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            header = self._read_zip_header(response.raw)
+            
+            body = _PrefixedStream(header, response.raw, content_length)
+            self._put_object(bucket, region, key, credentials, body, content_length)
+    
+    def _download_file(self, file_obj) -> str:
+        """Download file from Dify file object to temporary location"""
+        # 直接访问文件对象的属性
+        file_url = file_obj.url
+        filename = file_obj.filename or 'upload.zip'
+        
+        if not file_url:
+            raise Exception("File URL not provided")
+        
+        # Create temporary file
+        tmp = tempfile.NamedTemporaryFile(suffix=Path(filename).suffix or '.zip', delete=False)
+        temp_path = tmp.name
+        tmp.close()
+        
+        # Download file
+        try:
+            with self.session.get(file_url, headers=FILE_SERVER_HEADERS, stream=True, timeout=(3.05, 30)) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                header = self._read_zip_header(response.raw)
+                
+                with open(temp_path, 'wb') as f:
+                    f.write(header)
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+        
+        return temp_path
     
     def _get_cos_temp_token(self) -> Dict:
         """Get temporary COS token"""
@@ -235,6 +502,10 @@ class EdgeOneDeployer:
     
     def _describe_projects(self, project_id: str = "", project_name: str = "") -> List[Dict]:
         """Describe EdgeOne Pages projects"""
+        cache_key = (project_id, project_name)
+        if cache_key in self._projects_cache:
+            return self._projects_cache[cache_key]
+        
         filters = []
         if project_id:
             filters.append({"Name": "ProjectId", "Values": [project_id]})
@@ -250,7 +521,13 @@ class EdgeOneDeployer:
         }
         
         response = self._make_api_request(body)
-        return response.get('Data', {}).get('Response', {}).get('Projects', [])
+        projects = response.get('Data', {}).get('Response', {}).get('Projects', [])
+        
+        self._projects_cache[cache_key] = projects
+        if project_name and not project_id and len(projects) == 1:
+            # Later lookups of the same project go by ID
+            self._projects_cache[(projects[0]['ProjectId'], "")] = projects
+        return projects
     
     def _create_project(self) -> str:
         """Create new EdgeOne Pages project"""
@@ -265,6 +542,7 @@ class EdgeOneDeployer:
         }
         
         response = self._make_api_request(body)
+        self._projects_cache.clear()
         project_id = response.get('Data', {}).get('Response', {}).get('ProjectId')
         
         if not project_id:
@@ -294,22 +572,56 @@ class EdgeOneDeployer:
     
     def _poll_deployment_status(self, project_id: str, deployment_id: str) -> Dict:
         """Poll deployment status until completion"""
-        max_attempts = 60  # 5 minutes maximum
+        base_delay = 1.0
+        max_delay = 15.0
+        deadline = time.monotonic() + 300  # 5 minutes maximum
         attempt = 0
         
-        while attempt < max_attempts:
+        while time.monotonic() <= deadline:
             deployment = self._get_deployment_status(project_id, deployment_id)
             
             if deployment['Status'] != 'Process':
                 return deployment
             
-            time.sleep(5)
+            # Poll quickly at first, then back off exponentially with jitter
+            delay = min(max_delay, base_delay * (1.5 ** attempt)) + random.uniform(0, 0.5)
+            time.sleep(delay)
             attempt += 1
         
         raise Exception("Deployment timeout")
     
     def _get_deployment_status(self, project_id: str, deployment_id: str) -> Dict:
         """Get deployment status"""
+        if self._deployment_filter_supported:
+            body = {
+                'Action': 'DescribePagesDeployments',
+                'ProjectId': project_id,
+                'Filters': [{'Name': 'DeploymentId', 'Values': [deployment_id]}],
+                'Offset': 0,
+                'Limit': 1
+            }
+            
+            try:
+                response = self._make_api_request(body)
+            except EdgeOneAPIError:
+                # The API rejected the DeploymentId filter, list and scan from now on
+                self._deployment_filter_supported = False
+            else:
+                deployments = response.get('Data', {}).get('Response', {}).get('Deployments', [])
+                if deployments and deployments[0].get('DeploymentId') == deployment_id:
+                    return deployments[0]
+                if deployments:
+                    # The filter was ignored, list and scan from now on
+                    self._deployment_filter_supported = False
+        
+        for deployment in self._list_deployments(project_id):
+            if deployment.get('DeploymentId') == deployment_id:
+                return deployment
+        
+        raise Exception(f"Deployment {deployment_id} not found")
+    
+    def _list_deployments(self, project_id: str) -> List[Dict]:
+        """List recent deployments"""
         body = {
             'Action': 'DescribePagesDeployments',
             'ProjectId': project_id,
@@ -320,25 +632,27 @@ class EdgeOneDeployer:
         }
         
         response = self._make_api_request(body)
-        deployments = response.get('Data', {}).get('Response', {}).get('Deployments', [])
-        
-        for deployment in deployments:
-            if deployment.get('DeploymentId') == deployment_id:
-                return deployment
-        
-        raise Exception(f"Deployment {deployment_id} not found")
+        return response.get('Data', {}).get('Response', {}).get('Deployments', [])
     
     def _get_deployment_url(self, deployment_result: Dict, project_id: str, environment: str) -> str:
         """Get final deployment URL"""
         if deployment_result['Status'] != 'Success':
             raise Exception(f"Deployment failed with status: {deployment_result['Status']}")
         
-        # Get project details for domain info
-        projects = self._describe_projects(project_id=project_id)
-        if not projects:
-            raise Exception("Failed to get project details")
+        preview_domain = deployment_result.get('PreviewUrl', '').replace('https://', '')
+        
+        # Custom domains only apply to production, and a just-created temp project has none
+        is_temp_project = not self.project_name
+        needs_project = environment == 'Production' and not is_temp_project
         
-        project = projects[0]
+        project = {}
+        if needs_project or not preview_domain:
+            # Get project details for domain info
+            projects = self._describe_projects(project_id=project_id)
+            if not projects:
+                raise Exception("Failed to get project details")
+            
+            project = projects[0]
         
         # Check for custom domain in production
         if environment == 'Production' and project.get('CustomDomains'):
@@ -347,42 +661,52 @@ class EdgeOneDeployer:
                     return f"https://{domain['Domain']}"
         
         # Use preview URL or preset domain
-        domain = deployment_result.get('PreviewUrl', '').replace('https://', '') or project.get('PresetDomain', '')
+        domain = preview_domain or project.get('PresetDomain', '')
         
         if not domain:
             raise Exception("Failed to get deployment domain")
         
         # Get access token for temporary URL
-        token_response = self._get_encipher_token(domain)
-        token = token_response.get('Data', {}).get('Response', {}).get('Token')
-        timestamp = token_response.get('Data', {}).get('Response', {}).get('Timestamp')
-        
-        if not token or not timestamp:
-            raise Exception("Failed to get access token")
+        token, timestamp = self._get_encipher_token(domain)
         
         return f"https://{domain}?eo_token={token}&eo_time={timestamp}"
     
-    def _get_encipher_token(self, domain: str) -> Dict:
-        """Get encipher token for domain access"""
+    def _get_encipher_token(self, domain: str) -> Tuple[str, str]:
+        """Get encipher token and timestamp for domain access"""
+        with _ENCIPHER_CACHE_LOCK:
+            cached = _ENCIPHER_CACHE.get(domain)
+            if cached and time.monotonic() - cached[2] < ENCIPHER_CACHE_TTL:
+                return cached[0], cached[1]
+        
         body = {
             'Action': 'DescribePagesEncipherToken',
             'Text': domain
         }
         
-        return self._make_api_request(body)
+        token_response = self._make_api_request(body)
+        token = token_response.get('Data', {}).get('Response', {}).get('Token')
+        timestamp = token_response.get('Data', {}).get('Response', {}).get('Timestamp')
+        
+        if not token or not timestamp:
+            raise Exception("Failed to get access token")
+        
+        now = time.monotonic()
+        with _ENCIPHER_CACHE_LOCK:
+            # Temp projects get a fresh domain per deploy, so drop expired entries
+            for cached_domain, cached in list(_ENCIPHER_CACHE.items()):
+                if now - cached[2] >= ENCIPHER_CACHE_TTL:
+                    del _ENCIPHER_CACHE[cached_domain]
+            _ENCIPHER_CACHE[domain] = (token, timestamp, now)
+        
+        return token, timestamp
     
     def _make_api_request(self, body: Dict) -> Dict:
         """Make API request to EdgeOne"""
-        headers = {
-            'Authorization': f'Bearer {self.api_token}',
-            'Content-Type': 'application/json',
-        }
-        
-        response = requests.post(self.base_api_url, headers=headers, json=body, timeout=30)
+        response = self.session.post(self.base_api_url, data=_json_dumps(body), timeout=(3.05, 30))
         response.raise_for_status()
         
-        result = response.json()
+        result = _json_loads(response.content)
         if result.get('Code') != 0:
-            raise Exception(f"API error: {result.get('Message', 'Unknown error')}")
+            raise EdgeOneAPIError(f"API error: {result.get('Message', 'Unknown error')}")
         
         return result
\ No newline at end of file
@@ -81,7 +81,7 @@ class DeployHtmlTool(Tool):
     def _get_base_url(self) -> str:
         """Get the base URL for EdgeOne Pages deployment"""
         try:
-            response = requests.get('https://mcp.edgeone.site/get_base_url', timeout=30)
+            response = requests.get('https://mcp.edgeone.site/get_base_url', timeout=(3.05, 30))
             response.raise_for_status()
             
             data = response.json()
@@ -113,7 +113,7 @@ class DeployHtmlTool(Tool):
                 base_url,
                 headers=headers,
                 json=payload,
-                timeout=60
+                timeout=(3.05, 60)
             )
             response.raise_for_status()
             